@@ -9,14 +9,15 @@ import joblib
 import json
 import os
 from datetime import datetime
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
 from fastapi import Query
+from reportlab import rl_config
 from datetime import datetime, timezone
-import textwrap
 
 from auth import authenticate_user, create_access_token
-from routes.map import router as map_router
+from routes.map import router as map_router, bucket_risk
+from utils.singleflight import prediction_flight
+from utils.uncertainty import predict_with_uncertainty
+from utils.report_renderer import render_report
 
 
 # -------------------------------------------------------------------
@@ -30,6 +31,11 @@ REPORTS_DIR = os.path.join(BASE_DIR, "reports")
 
 os.makedirs(REPORTS_DIR, exist_ok=True)
 
+# Write PDF image streams as raw binary rather than ASCII85 text: smaller
+# reports and no per-report encoding pass over the plot pixels. This is a
+# process-wide reportlab setting; reports are the only PDFs this app makes.
+rl_config.useA85 = 0
+
 
 # -------------------------------------------------------------------
 # FEATURES (must match the pipeline input names EXACTLY)
@@ -156,22 +162,17 @@ def get_features():
     return {"features": FEATURES}
 
 
-# -------------------------------------------------------------------
-# RISK BUCKETING
-# -------------------------------------------------------------------
-def bucket_risk(score: float):
-    if score < -0.05:
-        return "Low"
-    elif score < 0.05:
-        return "Medium"
-    return "High"
+def input_key(df: pd.DataFrame):
+    """Hashable key for a single-row input, used to coalesce identical requests."""
+    return tuple(df.iloc[0].tolist())
 
 
 # -------------------------------------------------------------------
 # PREDICTION ENDPOINT
 # -------------------------------------------------------------------
 @app.post("/predict")
-def predict(input_data: ModelInput, model_name: str = "Random Forest"):
+def predict(input_data: ModelInput, model_name: str = "Random Forest",
+            uncertainty: bool = False):
 
     if model_name not in models:
         raise HTTPException(status_code=400, detail=f"Invalid model name: {model_name}")
@@ -181,10 +182,15 @@ def predict(input_data: ModelInput, model_name: str = "Random Forest"):
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    score = float(models[model_name].predict(df)[0])
-    risk = bucket_risk(score)
+    def run():
+        score = float(models[model_name].predict(df)[0])
+        risk = bucket_risk(score)
+        result = {"model": model_name, "score": score, "risk_category": risk}
+        if uncertainty:
+            result["uncertainty"] = predict_with_uncertainty(models[model_name], df, bucket_risk)
+        return result
 
-    return {"model": model_name, "score": score, "risk_category": risk}
+    return prediction_flight.do(("predict", model_name, uncertainty, input_key(df)), run)
 
 
 # -------------------------------------------------------------------
@@ -192,8 +198,6 @@ def predict(input_data: ModelInput, model_name: str = "Random Forest"):
 # -------------------------------------------------------------------
 @app.post("/compare")
 def compare_models(request: CompareRequest):
-    results = {}
-
     # Wrap feature DataFrame creation with validation
     try:
         # Reuse ModelInput for validation if possible
@@ -202,17 +206,29 @@ def compare_models(request: CompareRequest):
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid feature input: {e}")
 
-    for name in request.models:
-        if name not in models:
-            raise HTTPException(status_code=400, detail=f"Model '{name}' not found")
+    def run():
+        results = {}
+        for name in request.models:
+            if name not in models:
+                raise HTTPException(status_code=400, detail=f"Model '{name}' not found")
 
-        score = float(models[name].predict(df)[0])
-        results[name] = {
-            "score": score,
-            "risk_category": bucket_risk(score)
-        }
+            score = float(models[name].predict(df)[0])
+            results[name] = {
+                "score": score,
+                "risk_category": bucket_risk(score)
+            }
+        return results
 
-    return results
+    return prediction_flight.do(("compare", tuple(request.models), input_key(df)), run)
+
+
+# -------------------------------------------------------------------
+# REQUEST COALESCING STATS
+# -------------------------------------------------------------------
+@app.get("/coalescing-stats")
+def coalescing_stats():
+    """Number of requests that waited on an identical in-flight computation."""
+    return prediction_flight.stats()
 
 
 # -------------------------------------------------------------------
@@ -298,147 +314,11 @@ def generate_report(
     score = float(model.predict(df)[0])
     risk = bucket_risk(score)
 
-    # Prediction summary paragraph
-    pred_summary = (
-        f"The predicted gentrification risk score using {model_name} is {score:.4f}, "
-        f"which corresponds to a '{risk}' risk category. "
-        "This prediction reflects the combined influence of socio-economic, expenditure, "
-        "and spatial features for the given subcounty and time context."
-    )
-
     # Prepare PDF
     ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     fname = f"report_{model_name.replace(' ', '_')}_{ts}.pdf"
     out_path = os.path.join(REPORTS_DIR, fname)
-    c = canvas.Canvas(out_path, pagesize=A4)
-    width, height = A4
-    margin = 36
-    bottom_margin = 50
-    y_cursor = height - 50
-
-    # Header
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(margin, y_cursor, "Gentrification Risk Report")
-    y_cursor -= 30
-    c.setFont("Helvetica", 12)
-    c.drawString(margin, y_cursor, f"Model: {model_name}")
-    y_cursor -= 25
-    c.drawString(margin, y_cursor, f"Generated: {ts} (UTC)")
-    y_cursor -= 25
-
-    # Prediction section
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(margin, y_cursor, "Prediction")
-    y_cursor -= 25
-    c.setFont("Helvetica", 12)
-    c.drawString(margin, y_cursor, f"Score: {score:.4f}")
-    y_cursor -= 25
-    c.drawString(margin, y_cursor, f"Risk Category: {risk}")
-    y_cursor -= 25
-
-    # Utility: wrapped paragraph drawer
-    def draw_paragraph(text, max_width):
-        nonlocal y_cursor
-        lines = c.beginText(margin, y_cursor)
-        lines.setFont("Helvetica", 12)
-        for line in textwrap.wrap(text, width=90):
-            if y_cursor <= bottom_margin:
-                c.showPage()
-                y_cursor = height - margin
-                lines = c.beginText(margin, y_cursor)
-                lines.setFont("Helvetica", 12)
-            lines.textLine(line)
-            y_cursor -= 12
-        c.drawText(lines)
-
-    # Draw prediction summary
-    draw_paragraph(pred_summary, width - 2*margin)
-    y_cursor -= 25
-
-    # Context section
-    if subcounty or year:
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(margin, y_cursor, "Context")
-        y_cursor -= 25
-        c.setFont("Helvetica", 12)
-        if subcounty:
-            c.drawString(margin, y_cursor, f"Subcounty: {subcounty}")
-            y_cursor -= 25
-        if year:
-            c.drawString(margin, y_cursor, f"Year: {year}")
-            y_cursor -= 25
-        y_cursor -= 5
-
-    # Feature Importance resources
-    model_image_map = {
-        "Random Forest": "rf_fi.png",
-        "XGBoost": "xgb_fi.png",
-        "MLP": "mlp_fi.png"
-    }
-    model_top_features = {
-        "Random Forest": ["Rent", "Food", "Misc"],
-        "XGBoost": ["median_income", "employment_rate", "pop_density"],
-        "MLP": ["Rent", "employment_rate", "dist_to_cbd_km"]
-    }
-
-    reasoning = {
-        "Rent": "Higher rent indicates increasing economic pressure, which can push out lower income groups.",
-        "Food": "Higher food expenditure reflects overall household cost burdens that relate to affordability constraints.",
-        "Misc": "Miscellaneous expenditures capture other financial pressures that may influence displacement vulnerability.",
-        "median_income": "Higher median income typically reduces displacement risk by indicating improved financial stability.",
-        "employment_rate": "Higher employment rates often lower vulnerability to gentrification forces by improving household resilience.",
-        "pop_density": "High density areas tend to face stronger housing competition, which can magnify gentrification pressures.",
-        "dist_to_cbd_km": "Areas closer to the CBD tend to have higher demand, increasing potential gentrification pressure."
-    }
-
-    # Feature importance plot + summary
-    img_name = model_image_map.get(model_name)
-    if img_name:
-        img_path = os.path.join(PLOTS_DIR, img_name)
-        if os.path.exists(img_path):
-
-            img_height = 200
-            img_width = 520
-
-            if y_cursor - img_height - 60 < bottom_margin:
-                c.showPage()
-                y_cursor = height - margin
-
-            # Title
-            c.setFont("Helvetica-Bold", 11)
-            c.drawString(margin, y_cursor, f"{model_name} Feature Importance")
-            y_cursor -= 15
-
-            # Plot
-            c.drawImage(img_path, margin, y_cursor - img_height, width=img_width,
-                        height=img_height, preserveAspectRatio=True, mask='auto')
-            y_cursor -= img_height + 20  # add extra spacing
-
-            # Expanded reasoning summary (not bold)
-            top_feats = model_top_features.get(model_name, [])
-
-            if top_feats:
-                explanation_parts = []
-                for feat in top_feats:
-                    if feat in reasoning:
-                        explanation_parts.append(f"{feat}: {reasoning[feat]}")
-                expanded_reasoning = (
-                    f"The plot above shows the relative importance of features used by {model_name}. "
-                    f"The top {len(top_feats)} features are: "
-                    f"{', '.join(top_feats)}. "
-                    "The following is a breakdown of how each contributes to the model:\n\n"
-                    + "\n".join(explanation_parts)
-                )
-            else:
-                expanded_reasoning = (
-                    f"This plot displays the feature importance distribution for {model_name}."
-                )
-
-            draw_paragraph(expanded_reasoning, width - 2*margin)
-
-    # Finalize
-    c.showPage()
-    c.save()
+    render_report(out_path, model_name, score, risk, ts, subcounty=subcounty, year=year)
 
     return FileResponse(out_path, media_type="application/pdf", filename=fname)
 
@@ -0,0 +1,142 @@
+"""Compare report latency and file size: cached-section renderer vs the original.
+
+Each renderer is run with reportlab's ASCII85 image encoding on (the library
+default) and off (what app.py sets at startup), so the gain from cached plot
+decoding is reported separately from the gain from binary image streams.
+
+Run from backend/:
+
+    python -m benchmarks.report_benchmark [iterations]
+"""
+import os
+import sys
+import tempfile
+import textwrap
+import time
+from reportlab import rl_config
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from utils.report_renderer import (
+    MODEL_IMAGE_MAP, PLOTS_DIR, reasoning_text, render_report
+)
+
+SCORE = 0.0123
+RISK = "Medium"
+TS = "20260101T000000Z"
+SUBCOUNTY = "embakasi"
+YEAR = 2023
+
+
+def render_report_legacy(out_path, model_name, score, risk, ts, subcounty=None, year=None):
+    """The renderer generate_report used before sections were cached."""
+    pred_summary = (
+        f"The predicted gentrification risk score using {model_name} is {score:.4f}, "
+        f"which corresponds to a '{risk}' risk category. "
+        "This prediction reflects the combined influence of socio-economic, expenditure, "
+        "and spatial features for the given subcounty and time context."
+    )
+    c = canvas.Canvas(out_path, pagesize=A4)
+    width, height = A4
+    margin = 36
+    bottom_margin = 50
+    y_cursor = height - 50
+
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(margin, y_cursor, "Gentrification Risk Report")
+    y_cursor -= 30
+    c.setFont("Helvetica", 12)
+    c.drawString(margin, y_cursor, f"Model: {model_name}")
+    y_cursor -= 25
+    c.drawString(margin, y_cursor, f"Generated: {ts} (UTC)")
+    y_cursor -= 25
+
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(margin, y_cursor, "Prediction")
+    y_cursor -= 25
+    c.setFont("Helvetica", 12)
+    c.drawString(margin, y_cursor, f"Score: {score:.4f}")
+    y_cursor -= 25
+    c.drawString(margin, y_cursor, f"Risk Category: {risk}")
+    y_cursor -= 25
+
+    def draw_paragraph(text):
+        nonlocal y_cursor
+        lines = c.beginText(margin, y_cursor)
+        lines.setFont("Helvetica", 12)
+        for line in textwrap.wrap(text, width=90):
+            if y_cursor <= bottom_margin:
+                c.showPage()
+                y_cursor = height - margin
+                lines = c.beginText(margin, y_cursor)
+                lines.setFont("Helvetica", 12)
+            lines.textLine(line)
+            y_cursor -= 12
+        c.drawText(lines)
+
+    draw_paragraph(pred_summary)
+    y_cursor -= 25
+
+    if subcounty or year:
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(margin, y_cursor, "Context")
+        y_cursor -= 25
+        c.setFont("Helvetica", 12)
+        if subcounty:
+            c.drawString(margin, y_cursor, f"Subcounty: {subcounty}")
+            y_cursor -= 25
+        if year:
+            c.drawString(margin, y_cursor, f"Year: {year}")
+            y_cursor -= 25
+        y_cursor -= 5
+
+    img_name = MODEL_IMAGE_MAP.get(model_name)
+    if img_name:
+        img_path = os.path.join(PLOTS_DIR, img_name)
+        if os.path.exists(img_path):
+            img_height = 200
+            img_width = 520
+            if y_cursor - img_height - 60 < bottom_margin:
+                c.showPage()
+                y_cursor = height - margin
+            c.setFont("Helvetica-Bold", 11)
+            c.drawString(margin, y_cursor, f"{model_name} Feature Importance")
+            y_cursor -= 15
+            c.drawImage(img_path, margin, y_cursor - img_height, width=img_width,
+                        height=img_height, preserveAspectRatio=True, mask='auto')
+            y_cursor -= img_height + 20
+            draw_paragraph(reasoning_text(model_name))
+
+    c.showPage()
+    c.save()
+
+
+def bench(render, model_name, use_a85, out_dir, iterations):
+    out_path = os.path.join(out_dir, f"{render.__name__}.pdf")
+    previous = rl_config.useA85
+    rl_config.useA85 = use_a85
+    try:
+        render(out_path, model_name, SCORE, RISK, TS, SUBCOUNTY, YEAR)  # warm-up
+        start = time.perf_counter()
+        for _ in range(iterations):
+            render(out_path, model_name, SCORE, RISK, TS, SUBCOUNTY, YEAR)
+        elapsed = (time.perf_counter() - start) / iterations
+    finally:
+        rl_config.useA85 = previous
+    return elapsed * 1000, os.path.getsize(out_path)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"{'model':<15}{'renderer':<10}{'ascii85':<9}{'ms/report':>12}{'bytes':>12}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for model_name in MODEL_IMAGE_MAP:
+            for use_a85 in (1, 0):
+                for label, render in (("legacy", render_report_legacy), ("cached", render_report)):
+                    ms, size = bench(render, model_name, use_a85, out_dir, iterations)
+                    a85 = "on" if use_a85 else "off"
+                    print(f"{model_name:<15}{label:<10}{a85:<9}{ms:>12.2f}{size:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,9 @@ import joblib
 import os
 import json
 
+from utils.singleflight import prediction_flight
+from utils.uncertainty import predict_with_uncertainty
+
 router = APIRouter()
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # project root when placed in routes/
@@ -65,11 +68,23 @@ def normalize_subcounty(name: str) -> str:
         return SUBCOUNTY_PARENT[n]
     return n  # caller will validate further
 
+# -------------------------------
+# Helper: score -> risk category
+# -------------------------------
+def bucket_risk(score: float) -> str:
+    # You can replace these later with quantile bins if you want
+    if score < -0.05:
+        return "Low"
+    elif score < 0.05:
+        return "Medium"
+    return "High"
+
 # -------------------------------
 # Route: /map-predictions
 # -------------------------------
 @router.get("/map-predictions")
-def map_predictions(subcounty: str, model: str = "rf", year: int | None = None):
+def map_predictions(subcounty: str, model: str = "rf", year: int | None = None,
+                    uncertainty: bool = False):
     model = model.lower()
     if model not in models_map:
         raise HTTPException(status_code=400, detail=f"Invalid model '{model}'")
@@ -79,6 +94,16 @@ def map_predictions(subcounty: str, model: str = "rf", year: int | None = None):
     if sub_norm not in AVAILABLE_SUBCOUNTIES:
         raise HTTPException(status_code=400, detail=f"Subcounty '{subcounty}' not supported")
 
+    # Several map features (e.g. the embakasi polygons) normalize to the same
+    # subcounty, so concurrent identical lookups share one computation
+    return prediction_flight.do(
+        ("map-predictions", sub_norm, model, year, uncertainty),
+        lambda: _compute_map_prediction(sub_norm, model, year, uncertainty)
+    )
+
+
+def _compute_map_prediction(sub_norm: str, model: str, year: int | None,
+                            uncertainty: bool = False):
     # Load JSON
     ref_path = os.path.join(DATA_DIR, "subcounty_reference_updated.json")
     if not os.path.exists(ref_path):
@@ -128,19 +153,14 @@ def map_predictions(subcounty: str, model: str = "rf", year: int | None = None):
     model_pipeline = models_map[model]
     try:
         score = float(model_pipeline.predict(X)[0])
+        risk = bucket_risk(score)
 
-        # You can replace these later with quantile bins if you want
-        if score < -0.05:
-            risk = "Low"
-        elif score < 0.05:
-            risk = "Medium"
-        else:
-            risk = "High"
+        spread = predict_with_uncertainty(model_pipeline, X, bucket_risk) if uncertainty else None
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error predicting: {e}")
 
-    return {
+    result = {
         "subcounty": sub_norm,
         "year": int(chosen_year),
         "model": model,
@@ -148,4 +168,7 @@ def map_predictions(subcounty: str, model: str = "rf", year: int | None = None):
         "risk_category": risk,
         "features_used": row  # useful for debugging
     }
+    if spread is not None:
+        result["uncertainty"] = spread
+    return result
 
@@ -0,0 +1,188 @@
+import os
+import textwrap
+from functools import lru_cache
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # project root when placed in utils/
+PLOTS_DIR = os.path.join(BASE_DIR, "plots")
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+MARGIN = 36
+BOTTOM_MARGIN = 50
+LINE_HEIGHT = 12
+WRAP_WIDTH = 90
+IMG_WIDTH = 520
+IMG_HEIGHT = 200
+
+# Feature Importance resources
+MODEL_IMAGE_MAP = {
+    "Random Forest": "rf_fi.png",
+    "XGBoost": "xgb_fi.png",
+    "MLP": "mlp_fi.png"
+}
+MODEL_TOP_FEATURES = {
+    "Random Forest": ["Rent", "Food", "Misc"],
+    "XGBoost": ["median_income", "employment_rate", "pop_density"],
+    "MLP": ["Rent", "employment_rate", "dist_to_cbd_km"]
+}
+REASONING = {
+    "Rent": "Higher rent indicates increasing economic pressure, which can push out lower income groups.",
+    "Food": "Higher food expenditure reflects overall household cost burdens that relate to affordability constraints.",
+    "Misc": "Miscellaneous expenditures capture other financial pressures that may influence displacement vulnerability.",
+    "median_income": "Higher median income typically reduces displacement risk by indicating improved financial stability.",
+    "employment_rate": "Higher employment rates often lower vulnerability to gentrification forces by improving household resilience.",
+    "pop_density": "High density areas tend to face stronger housing competition, which can magnify gentrification pressures.",
+    "dist_to_cbd_km": "Areas closer to the CBD tend to have higher demand, increasing potential gentrification pressure."
+}
+
+
+class FeatureSection:
+    """Feature-importance block for one model: title, decoded plot and wrapped reasoning."""
+
+    def __init__(self, model_name: str, image: ImageReader, lines: list):
+        self.model_name = model_name
+        self.image = image
+        self.lines = lines
+
+
+def load_plot(path: str) -> ImageReader:
+    """Decode a PNG once and keep its pixel data in memory for later reports.
+
+    An alpha channel, if any, is split off here too; its mask data is decoded
+    on the first drawImage and then cached by the reader.
+    """
+    reader = ImageReader(path)
+    reader.getSize()
+    reader.getRGBData()
+    return reader
+
+
+def reasoning_text(model_name: str) -> str:
+    top_feats = MODEL_TOP_FEATURES.get(model_name, [])
+    if not top_feats:
+        return f"This plot displays the feature importance distribution for {model_name}."
+
+    explanation_parts = []
+    for feat in top_feats:
+        if feat in REASONING:
+            explanation_parts.append(f"{feat}: {REASONING[feat]}")
+    return (
+        f"The plot above shows the relative importance of features used by {model_name}. "
+        f"The top {len(top_feats)} features are: "
+        f"{', '.join(top_feats)}. "
+        "The following is a breakdown of how each contributes to the model:\n\n"
+        + "\n".join(explanation_parts)
+    )
+
+
+@lru_cache(maxsize=None)
+def feature_section(model_name: str) -> FeatureSection | None:
+    """Build (once per model) the static feature-importance section."""
+    img_name = MODEL_IMAGE_MAP.get(model_name)
+    if not img_name:
+        return None
+    img_path = os.path.join(PLOTS_DIR, img_name)
+    if not os.path.exists(img_path):
+        return None
+
+    lines = textwrap.wrap(reasoning_text(model_name), width=WRAP_WIDTH)
+    return FeatureSection(model_name, load_plot(img_path), lines)
+
+
+def render_report(out_path: str, model_name: str, score: float, risk: str, ts: str,
+                  subcounty: str | None = None, year: int | None = None):
+    """Write the PDF report for a single prediction to out_path.
+
+    The feature-importance plot is decoded and its reasoning text wrapped once
+    per model (see feature_section); each report only wraps the prediction
+    summary and draws the cached pieces.
+    """
+    # Prediction summary paragraph
+    pred_summary = (
+        f"The predicted gentrification risk score using {model_name} is {score:.4f}, "
+        f"which corresponds to a '{risk}' risk category. "
+        "This prediction reflects the combined influence of socio-economic, expenditure, "
+        "and spatial features for the given subcounty and time context."
+    )
+
+    c = canvas.Canvas(out_path, pagesize=A4)
+    y_cursor = PAGE_HEIGHT - 50
+
+    # Utility: wrapped paragraph drawer
+    def draw_lines(lines):
+        nonlocal y_cursor
+        text = c.beginText(MARGIN, y_cursor)
+        text.setFont("Helvetica", 12)
+        for line in lines:
+            if y_cursor <= BOTTOM_MARGIN:
+                c.drawText(text)
+                c.showPage()
+                y_cursor = PAGE_HEIGHT - MARGIN
+                text = c.beginText(MARGIN, y_cursor)
+                text.setFont("Helvetica", 12)
+            text.textLine(line)
+            y_cursor -= LINE_HEIGHT
+        c.drawText(text)
+
+    # Header
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(MARGIN, y_cursor, "Gentrification Risk Report")
+    y_cursor -= 30
+    c.setFont("Helvetica", 12)
+    c.drawString(MARGIN, y_cursor, f"Model: {model_name}")
+    y_cursor -= 25
+    c.drawString(MARGIN, y_cursor, f"Generated: {ts} (UTC)")
+    y_cursor -= 25
+
+    # Prediction section
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(MARGIN, y_cursor, "Prediction")
+    y_cursor -= 25
+    c.setFont("Helvetica", 12)
+    c.drawString(MARGIN, y_cursor, f"Score: {score:.4f}")
+    y_cursor -= 25
+    c.drawString(MARGIN, y_cursor, f"Risk Category: {risk}")
+    y_cursor -= 25
+
+    # Draw prediction summary
+    draw_lines(textwrap.wrap(pred_summary, width=WRAP_WIDTH))
+    y_cursor -= 25
+
+    # Context section
+    if subcounty or year:
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(MARGIN, y_cursor, "Context")
+        y_cursor -= 25
+        c.setFont("Helvetica", 12)
+        if subcounty:
+            c.drawString(MARGIN, y_cursor, f"Subcounty: {subcounty}")
+            y_cursor -= 25
+        if year:
+            c.drawString(MARGIN, y_cursor, f"Year: {year}")
+            y_cursor -= 25
+        y_cursor -= 5
+
+    # Feature importance plot + summary
+    section = feature_section(model_name)
+    if section:
+        if y_cursor - IMG_HEIGHT - 60 < BOTTOM_MARGIN:
+            c.showPage()
+            y_cursor = PAGE_HEIGHT - MARGIN
+
+        # Title
+        c.setFont("Helvetica-Bold", 11)
+        c.drawString(MARGIN, y_cursor, f"{model_name} Feature Importance")
+        y_cursor -= 15
+
+        # Plot
+        c.drawImage(section.image, MARGIN, y_cursor - IMG_HEIGHT, width=IMG_WIDTH,
+                    height=IMG_HEIGHT, preserveAspectRatio=True, mask='auto')
+        y_cursor -= IMG_HEIGHT + 20  # add extra spacing
+
+        draw_lines(section.lines)
+
+    # Finalize
+    c.showPage()
+    c.save()